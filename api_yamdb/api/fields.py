@@ -0,0 +1,49 @@
+from django.utils.encoding import smart_str
+from rest_framework.relations import (MANY_RELATION_KWARGS, ManyRelatedField,
+                                      SlugRelatedField)
+
+
+class BulkSlugManyRelatedField(ManyRelatedField):
+    """Список слагов, который разрешается одним запросом к БД,
+    а не отдельным запросом на каждый слаг"""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        child = self.child_relation
+        slug_field = child.slug_field
+        try:
+            objects = {
+                smart_str(getattr(obj, slug_field)): obj
+                for obj in child.get_queryset().filter(
+                    **{f'{slug_field}__in': data}
+                )
+            }
+        except (TypeError, ValueError):
+            child.fail('invalid')
+        result = []
+        for slug in data:
+            obj = objects.get(smart_str(slug))
+            if obj is None:
+                child.fail(
+                    'does_not_exist',
+                    slug_name=slug_field,
+                    value=smart_str(slug)
+                )
+            result.append(obj)
+        return result
+
+
+class BulkSlugRelatedField(SlugRelatedField):
+    """SlugRelatedField, который при many=True проверяет все слаги
+    одним запросом"""
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BulkSlugManyRelatedField(**list_kwargs)
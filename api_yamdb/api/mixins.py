@@ -1,3 +1,5 @@
+import copy
+
 from rest_framework.mixins import (CreateModelMixin, DestroyModelMixin,
                                    ListModelMixin)
 from rest_framework.viewsets import GenericViewSet
@@ -6,3 +8,15 @@ from rest_framework.viewsets import GenericViewSet
 class ModelMixinSet(CreateModelMixin, ListModelMixin,
                     DestroyModelMixin, GenericViewSet):
     pass
+
+
+class CachedFieldsMixin:
+    """Запоминает поля сериализатора на классе после первого разбора
+    модели, новым экземплярам отдаются их копии. Только для
+    сериализаторов, набор полей которых не зависит от контекста"""
+
+    def get_fields(self):
+        cls = type(self)
+        if '_cached_fields' not in cls.__dict__:
+            cls._cached_fields = super().get_fields()
+        return copy.deepcopy(cls._cached_fields)
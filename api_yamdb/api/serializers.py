@@ -1,19 +1,41 @@
 from django.conf import settings
+from django.db.models import Manager, Prefetch, prefetch_related_objects
 from rest_framework import serializers
-from rest_framework.generics import get_object_or_404
-from rest_framework.relations import SlugRelatedField
-from rest_framework.validators import UniqueTogetherValidator
+from rest_framework.validators import UniqueValidator
 
+from api.fields import BulkSlugRelatedField
+from api.mixins import CachedFieldsMixin
 from reviews.models import Category, Comment, Genre, Review, Title
-from users.models import User, CHOICE_ROLES
+from users.models import User, VALID_ROLES
 from users.utils import get_unique_confirmation_code
 from users.utils import username_validate, email_validate
 
 
+# Общий queryset для валидаторов уникальности, клонируется при фильтрации
+USER_QUERYSET = User.objects.all()
+
+
+class EagerLoadingListSerializer(serializers.ListSerializer):
+    """Список, который сам догружает связи дочернего сериализатора
+    (SELECT_RELATED и PREFETCH_RELATED) одним запросом на связь, если
+    они не были подгружены в queryset"""
+
+    def to_representation(self, data):
+        if isinstance(data, Manager):
+            data = data.all()
+        objects = list(data)
+        prefetch_related_objects(
+            objects,
+            *self.child.SELECT_RELATED,
+            *self.child.PREFETCH_RELATED
+        )
+        return super().to_representation(objects)
+
+
 class CategorySerializer(serializers.ModelSerializer):
 
     class Meta:
-        exclude = ('id', )
+        fields = ('name', 'slug')
         model = Category
         lookup_field = 'slug'
 
@@ -21,12 +43,12 @@ class CategorySerializer(serializers.ModelSerializer):
 class GenreSerializer(serializers.ModelSerializer):
 
     class Meta:
-        exclude = ('id', )
+        fields = ('name', 'slug')
         model = Genre
         lookup_field = 'slug'
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
+class TitleReadSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     genre = GenreSerializer(
         read_only=True,
@@ -34,9 +56,85 @@ class TitleReadSerializer(serializers.ModelSerializer):
     )
     rating = serializers.IntegerField(read_only=True)
 
+    SELECT_RELATED = ('category',)
+    PREFETCH_RELATED = (
+        Prefetch('genre', queryset=Genre.objects.order_by('slug')),
+    )
+    VALUES = (
+        'id', 'name', 'year', 'rating', 'description',
+        'category__name', 'category__slug'
+    )
+
     class Meta:
-        fields = '__all__'
+        fields = (
+            'id', 'name', 'year', 'rating', 'description', 'genre', 'category'
+        )
         model = Title
+        list_serializer_class = EagerLoadingListSerializer
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Подгружает связанные категорию и жанры заранее, чтобы
+        не делать отдельный запрос на каждое произведение"""
+        return queryset.select_related(
+            *cls.SELECT_RELATED
+        ).prefetch_related(*cls.PREFETCH_RELATED)
+
+    @staticmethod
+    def represent(title_id, name, year, rating, description, genre,
+                  category):
+        """Единственное место, где задана форма ответа о произведении.
+        genre - пары (name, slug), category - пара (name, slug) или None"""
+        return {
+            'id': title_id,
+            'name': name,
+            'year': year,
+            'rating': None if rating is None else int(rating),
+            'description': description,
+            'genre': [
+                {'name': genre_name, 'slug': genre_slug}
+                for genre_name, genre_slug in genre
+            ],
+            'category': None if category is None else {
+                'name': category[0], 'slug': category[1]
+            },
+        }
+
+    @classmethod
+    def from_values(cls, rows, genres):
+        """Собирает ответ из строк queryset.values(*VALUES) без создания
+        моделей. genres - пары (name, slug) по id произведения"""
+        return [
+            cls.represent(
+                title_id=row['id'],
+                name=row['name'],
+                year=row['year'],
+                rating=row['rating'],
+                description=row['description'],
+                genre=genres.get(row['id'], ()),
+                category=None if row['category__slug'] is None else (
+                    row['category__name'], row['category__slug']
+                ),
+            )
+            for row in rows
+        ]
+
+    def to_representation(self, instance):
+        """Форма ответа фиксирована, поэтому собираем его напрямую,
+        без обхода полей сериализатора. Результат совпадает с
+        ModelSerializer.to_representation"""
+        category = instance.category
+        return self.represent(
+            title_id=instance.id,
+            name=instance.name,
+            year=instance.year,
+            rating=getattr(instance, 'rating', None),
+            description=instance.description,
+            genre=[(genre.name, genre.slug) for genre in instance.genre.all()],
+            category=None if category is None else (
+                category.name, category.slug
+            ),
+        )
 
 
 class TitleWriteSerializer(serializers.ModelSerializer):
@@ -44,7 +142,7 @@ class TitleWriteSerializer(serializers.ModelSerializer):
         queryset=Category.objects.all(),
         slug_field='slug'
     )
-    genre = serializers.SlugRelatedField(
+    genre = BulkSlugRelatedField(
         queryset=Genre.objects.all(),
         slug_field='slug',
         many=True
@@ -55,54 +153,39 @@ class TitleWriteSerializer(serializers.ModelSerializer):
         model = Title
 
 
-class ReviewSerializer(serializers.ModelSerializer):
-    author = SlugRelatedField(
-        slug_field='username',
-        read_only=True
-    )
-    title = SlugRelatedField(
-        slug_field='name',
-        read_only=True
-    )
+class ReviewSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    author = serializers.CharField(source='author.username', read_only=True)
 
-    def validate(self, data):
-        request = self.context['request']
-        author = request.user
-        title_id = self.context['view'].kwargs.get('title_id')
-        title = get_object_or_404(Title, pk=title_id)
-        # проверяем, хочет ли юзер отправить запрос на создание Отзыва
-        if request.method == 'POST':
-            # проверяем есть ли отзыв у этого произведения
-            # и принадлежит ли он автору запроса
-            if Review.objects.filter(title=title, author=author).exists():
-                raise serializers.ValidationError(
-                    'Нельзя добавить больше одного отзыва'
-                )
-        return data
+    SELECT_RELATED = ('author',)
+    PREFETCH_RELATED = ()
 
     class Meta:
         fields = '__all__'
+        read_only_fields = ('title',)
         model = Review
+        list_serializer_class = EagerLoadingListSerializer
 
 
-class CommentSerializer(serializers.ModelSerializer):
-    author = SlugRelatedField(
-        read_only=True, slug_field='username'
-    )
-    reviews = SlugRelatedField(
-        slug_field='text', read_only=True
-    )
+class CommentSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    author = serializers.CharField(source='author.username', read_only=True)
 
     class Meta:
         fields = '__all__'
+        read_only_fields = ('review',)
         model = Comment
 
 
 class UserSerializer(serializers.ModelSerializer):
     """Сериализатор модели User для обычных пользователей - не админов"""
 
-    email = serializers.EmailField(max_length=254)
-    username = serializers.CharField(max_length=150)
+    email = serializers.EmailField(
+        max_length=254,
+        validators=(UniqueValidator(queryset=USER_QUERYSET),)
+    )
+    username = serializers.CharField(
+        max_length=150,
+        validators=(UniqueValidator(queryset=USER_QUERYSET),)
+    )
 
     class Meta:
         model = User
@@ -115,15 +198,8 @@ class UserSerializer(serializers.ModelSerializer):
             'role'
         ]
 
-        validators = (
-            UniqueTogetherValidator(
-                queryset=User.objects.all(),
-                fields=['username', 'email']
-            ),
-        )
-
     def create(self, validated_data):
-        confirm_code = str(get_unique_confirmation_code)
+        confirm_code = get_unique_confirmation_code()
         return User.objects.create(
             **validated_data,
             confirmation_code=confirm_code
@@ -131,16 +207,24 @@ class UserSerializer(serializers.ModelSerializer):
 
 
     def validate(self, data):
-        username_validate(str(data.get('username')))
-        email_validate(str(data.get('email')))
+        # уникальность почты проверяет UniqueValidator поля email,
+        # при частичном обновлении поля username может не быть
+        if 'username' in data:
+            username_validate(data['username'])
         return data
 
 
 class MeSerializer(serializers.ModelSerializer):
     """Сериализатор модели User для редактирования профайла"""
 
-    email = serializers.EmailField(max_length=254)
-    username = serializers.CharField(max_length=150)
+    email = serializers.EmailField(
+        max_length=254,
+        validators=(UniqueValidator(queryset=USER_QUERYSET),)
+    )
+    username = serializers.CharField(
+        max_length=150,
+        validators=(UniqueValidator(queryset=USER_QUERYSET),)
+    )
     role = serializers.CharField(max_length=15, read_only=True)
 
     class Meta:
@@ -154,16 +238,9 @@ class MeSerializer(serializers.ModelSerializer):
             'role'
         ]
 
-        validators = (
-            UniqueTogetherValidator(
-                queryset=User.objects.all(),
-                fields=['username', 'email']
-            ),
-        )
-
     def validate(self, data):
-        username_validate(str(data.get('username')))
-        email_validate(str(data.get('email')))
+        if 'username' in data:
+            username_validate(data['username'])
         return data
 
 
@@ -171,8 +248,14 @@ class AdminOrSuperAdminUserSerializer(serializers.ModelSerializer):
     """Сериализатор модели User для пользователей админ и суперадмин.
     Этим пользователям доступно редактирование роли"""
 
-    email = serializers.EmailField(max_length=254)
-    username = serializers.CharField(max_length=150)
+    email = serializers.EmailField(
+        max_length=254,
+        validators=(UniqueValidator(queryset=USER_QUERYSET),)
+    )
+    username = serializers.CharField(
+        max_length=150,
+        validators=(UniqueValidator(queryset=USER_QUERYSET),)
+    )
     role = serializers.CharField(max_length=15, default='user')
 
     class Meta:
@@ -186,28 +269,21 @@ class AdminOrSuperAdminUserSerializer(serializers.ModelSerializer):
             'role',
         ]
 
-        validators = (
-            UniqueTogetherValidator(
-                queryset=User.objects.all(),
-                fields=['username', 'email']
-            ),
-        )
-
     def create(self, validated_data):
-        confirm_code = str(get_unique_confirmation_code)
+        confirm_code = get_unique_confirmation_code()
         return User.objects.create(
             **validated_data,
             confirmation_code=confirm_code
         )
 
     def validate(self, data):
-        username_validate(str(data.get('username')))
-        email_validate(str(data.get('email')))
-        role = str(data.get('role'))
-        if  (any(role in i for i in CHOICE_ROLES)):
-                raise serializers.ValidationError(
-                    'Задана не существующая роль'
-                )
+        if 'username' in data:
+            username_validate(data['username'])
+        role = data.get('role')
+        if role is not None and role not in VALID_ROLES:
+            raise serializers.ValidationError(
+                'Задана не существующая роль'
+            )
         return data
 
 
@@ -217,13 +293,6 @@ class SignUpSerializer(serializers.ModelSerializer):
     username = serializers.CharField(max_length=150)
     email = serializers.EmailField(max_length=254)
 
-    class Meta:
-        model = User
-        fields = [
-            'username',
-            'email'
-        ]
-
     class Meta:
         model = User
         fields = [
@@ -232,8 +301,8 @@ class SignUpSerializer(serializers.ModelSerializer):
         ]
 
     def validate(self, data):
-        username_validate(str(data.get('username')))
-        email_validate(str(data.get('username')))
+        username_validate(data['username'])
+        email_validate(data['email'])
         return data
 
 
@@ -253,11 +322,5 @@ class TokenSerializer(serializers.ModelSerializer):
         ]
 
     def validate(self, data):
-        username = str(data.get('username'))
-        confirmation_code = data.get('confirmation_code')
-        if confirmation_code is None:
-            raise serializers.ValidationError(
-                'Код подтверждения не может быть пустым'
-                )
-        username_validate(username)
+        username_validate(data['username'])
         return data
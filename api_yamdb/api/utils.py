@@ -0,0 +1,32 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.serializers import ModelSerializer
+
+
+def only_fields_for(serializer_class):
+    """Список полей для QuerySet.only() по Meta.fields сериализатора.
+    Поля вложенных сериализаторов по внешнему ключу раскрываются в
+    пути вида category__slug, многие-ко-многим и аннотации пропускаются"""
+
+    fields = serializer_class.Meta.fields
+    assert isinstance(fields, (list, tuple)), (
+        f'{serializer_class.__name__}.Meta.fields должен быть списком '
+        f'или кортежем полей, а не {fields!r}.'
+    )
+    opts = serializer_class.Meta.model._meta
+    declared = serializer_class._declared_fields
+    only = []
+    for name in fields:
+        try:
+            model_field = opts.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        if model_field.many_to_many or model_field.one_to_many:
+            continue
+        only.append(name)
+        nested = declared.get(name)
+        if isinstance(nested, ModelSerializer):
+            only.extend(
+                f'{name}__{field}'
+                for field in only_fields_for(type(nested))
+            )
+    return only
@@ -1,12 +1,17 @@
+from collections import defaultdict
+
 from api.filters import TitleFilter
+from django.db import IntegrityError, transaction
 from django.db.models import Avg
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status, viewsets, filters
 from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from users.utils import (get_unique_confirmation_code,
                          sent_email_with_confirmation_code)
 from rest_framework_simplejwt.tokens import AccessToken
@@ -14,6 +19,7 @@ from rest_framework_simplejwt.tokens import AccessToken
 from reviews.models import Category, Genre, Review, Title
 from users.models import User
 from .mixins import ModelMixinSet
+from api.utils import only_fields_for
 from api.permissions import (IsAdminUserOrReadOnly, IsAdmin,
                              AdminModeratorAuthorPermission)
 from api.serializers import (CategorySerializer,
@@ -61,17 +67,47 @@ class TitleViewSet(viewsets.ModelViewSet):
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
     
+    def get_queryset(self):
+        return TitleReadSerializer.setup_eager_loading(
+            super().get_queryset()
+        )
+
     def get_serializer_class(self):
         if self.action in ('list', 'retrieve'):
             return TitleReadSerializer
         return TitleWriteSerializer
 
+    def list(self, request, *args, **kwargs):
+        """Список собирается из values() без создания моделей"""
+        queryset = self.filter_queryset(
+            super().get_queryset()
+        ).values(*TitleReadSerializer.VALUES)
+        page = self.paginate_queryset(queryset)
+        rows = list(queryset) if page is None else page
+        data = TitleReadSerializer.from_values(rows, self.get_genres(rows))
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
+
+    def get_genres(self, rows):
+        """Жанры произведений из rows одним запросом: пары (name, slug)
+        по id произведения в том же порядке, что и в детальном ответе"""
+        genres = defaultdict(list)
+        genre_rows = Title.genre.through.objects.filter(
+            title_id__in=[row['id'] for row in rows]
+        ).order_by('genre__slug').values_list(
+            'title_id', 'genre__name', 'genre__slug'
+        )
+        for title_id, name, slug in genre_rows:
+            genres[title_id].append((name, slug))
+        return genres
+
 
 class UserViewSet(viewsets.ModelViewSet):
     """Класс для работы с пользователем(ми)"""
     
     http_method_names = ['get', 'post', 'patch', 'delete']
-    queryset = User.objects.all()
+    queryset = User.objects.only(*only_fields_for(UserSerializer))
     serializer_class = AdminOrSuperAdminUserSerializer
     permission_classes = [IsAdmin, ]
     lookup_field = 'username'
@@ -147,11 +183,13 @@ def signup(request):
             )
         # Формируем код подтверждения
         confirm_code = get_unique_confirmation_code()
-        user, _created = User.objects.get_or_create(
+        user, created = User.objects.get_or_create(
             username=username,
-            email=user_email)
-        user.confirmation_code = confirm_code
-        user.save()
+            email=user_email,
+            defaults={'confirmation_code': confirm_code})
+        if not created:
+            user.confirmation_code = confirm_code
+            user.save(update_fields=('confirmation_code',))
         # отправляем письмо с кодом подтверждения
         sent_email_with_confirmation_code(user_email, confirm_code)
         
@@ -183,15 +221,29 @@ class ReviewViewSet(viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
     permission_classes = [AdminModeratorAuthorPermission]
     
+    def get_title(self):
+        return get_object_or_404(Title, pk=self.kwargs.get('title_id'))
+
     def get_queryset(self):
-        title = get_object_or_404(Title,
-                                  pk=self.kwargs.get('title_id'))
-        return title.reviews.all()
+        return self.get_title().reviews.select_related('author')
     
     def perform_create(self, serializer):
-        title_id = self.kwargs.get('title_id')
-        title = get_object_or_404(Title, id=title_id)
-        serializer.save(author=self.request.user, title=title)
+        title = self.get_title()
+        # повторный отзыв отсекает ограничение unique review в БД
+        try:
+            with transaction.atomic():
+                serializer.save(author=self.request.user, title=title)
+        except IntegrityError:
+            # ошибка может прийти и от уникальности текста отзыва
+            if not Review.objects.filter(
+                title=title, author=self.request.user
+            ).exists():
+                raise
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Нельзя добавить больше одного отзыва'
+                ]
+            })
 
 
 class CommentViewSet(viewsets.ModelViewSet):
@@ -201,7 +253,7 @@ class CommentViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         review = get_object_or_404(Review,
                                    pk=self.kwargs.get('review_id'))
-        return review.comments.all()
+        return review.comments.select_related('author')
     
     def perform_create(self, serializer):
         review = get_object_or_404(
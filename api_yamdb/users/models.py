@@ -12,6 +12,8 @@ CHOICE_ROLES = [
     (ADMIN, ADMIN),
     (MODERATOR, MODERATOR),
 ]
+# Множество допустимых ролей для быстрой проверки
+VALID_ROLES = frozenset(role for role, _ in CHOICE_ROLES)
 
 
 class User(AbstractUser):
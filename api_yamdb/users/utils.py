@@ -1,7 +1,5 @@
 import re
-from hashlib import sha1
-from random import choice
-from string import ascii_lowercase
+import secrets
 
 from django.conf import settings
 from django.core.mail import send_mail
@@ -9,37 +7,34 @@ from rest_framework.exceptions import ValidationError
 from users.models import User
 
 
+# Шаблон компилируется один раз при импорте, а не на каждый запрос
+USERNAME_REGEX = re.compile(r'[\w.@+-]+')
+# Случайных байт в коде подтверждения, в base64 это 43 символа
+CONFIRMATION_CODE_BYTES = 32
+
+
 def username_validate(name):
     """Проверка имени пользователя"""
-    regex = re.compile(r'^[\w.@+-]+')
-    if not regex.match(name):
+    if not USERNAME_REGEX.fullmatch(name):
         raise ValidationError('Не допустимые символы в имени')
     if name == 'me':
         raise ValidationError(
             'me не может быть использовано в качестве имени пользоателя'
         )
-    if name is None or name == "":
-        raise ValidationError(
-            'имя не может быть пустым'
-        )
 
 
 def email_validate(value):
     """Проверка наличия такой почты в БД"""
     
-    if User.objects.filter(email=value):
+    if User.objects.filter(email=value).exists():
         raise ValidationError('Такая почта уже зарегистрирована в БД')
 
 
 def get_unique_confirmation_code():
     """Функция генерации кода подтверждения для отправки пользователю"""
     
-    code = "".join(
-        [
-            choice(ascii_lowercase) for _ in range(settings.MAX_CODE_LENGTH)
-        ]
-    )
-    return sha1(code.encode()).hexdigest()[:settings.MAX_CODE_LENGTH]
+    code = secrets.token_urlsafe(CONFIRMATION_CODE_BYTES)
+    return code[:settings.MAX_CODE_LENGTH]
 
 
 def sent_email_with_confirmation_code(to_email, code):
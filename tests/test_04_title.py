@@ -1,7 +1,10 @@
 from http import HTTPStatus
 
 import pytest
+from rest_framework.serializers import ModelSerializer
 
+from api.serializers import TitleReadSerializer
+from api.views import TitleViewSet
 from tests.utils import (check_pagination, check_permissions,
                          create_categories, create_genre, create_titles)
 
@@ -316,3 +319,73 @@ class Test04TitleAPI:
                           HTTPStatus.FORBIDDEN)
         check_permissions(moderator_client, url, data, 'модератора',
                           titles, HTTPStatus.FORBIDDEN)
+
+    def test_06_titles_unknown_genre(self, admin_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        url = '/api/v1/titles/'
+
+        data = {
+            'name': 'Мост через реку Квай',
+            'year': 1957,
+            'genre': [genres[0]['slug'], 'not-a-genre'],
+            'category': categories[0]['slug'],
+            'description': 'Рон Свонсон рекомендует.'
+        }
+        response = admin_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что при обработке POST-запроса администратора к '
+            f'`{url}` проверяется, что все переданные в поле `genre` жанры '
+            'существуют.'
+        )
+        assert 'genre' in response.json(), (
+            'Проверьте, что ответ на POST-запрос с несуществующим жанром '
+            'содержит ошибку для поля `genre`.'
+        )
+
+    def test_07_titles_list_query_count(self, client, admin_client,
+                                        django_assert_num_queries):
+        create_titles(admin_client)
+        url = '/api/v1/titles/'
+
+        # count для пагинации, произведения с рейтингом и категорией,
+        # жанры одним запросом - независимо от числа произведений
+        with django_assert_num_queries(3):
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+
+    def test_08_titles_representation_matches_model_serializer(
+            self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        user_client.post(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            data={'text': 'Отлично', 'score': 7}
+        )
+        queryset = TitleViewSet(kwargs={}, request=None).get_queryset()
+        for title in queryset:
+            serializer = TitleReadSerializer(title)
+            assert serializer.data == ModelSerializer.to_representation(
+                serializer, title
+            ), (
+                'Проверьте, что `TitleReadSerializer.to_representation` '
+                'возвращает те же данные, что и `ModelSerializer`.'
+            )
+
+    def test_09_titles_list_matches_detail(self, client, admin_client,
+                                           user_client):
+        titles, _, _ = create_titles(admin_client)
+        user_client.post(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            data={'text': 'Отлично', 'score': 7}
+        )
+        url = '/api/v1/titles/'
+        response = client.get(url)
+        for title in response.json()['results']:
+            detail = client.get(f'{url}{title["id"]}/').json()
+            assert title == detail, (
+                f'Проверьте, что элементы списка `{url}` совпадают с '
+                f'ответом на GET-запрос к `{url}{{title_id}}/`.'
+            )
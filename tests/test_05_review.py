@@ -99,6 +99,13 @@ class Test05ReviewAPI:
             '`/api/v1/titles/{title_id}/reviews/` вернёт ответ со '
             'статусом 400.'
         )
+        assert response.json() == {
+            'non_field_errors': ['Нельзя добавить больше одного отзыва']
+        }, (
+            'Проверьте, что при попытке пользователя создать второй отзыв на '
+            'одно и то же произведение ответ содержит ошибку в ключе '
+            '`non_field_errors`.'
+        )
 
         try:
             from reviews.models import Review, Title